@@ -17,14 +17,24 @@ Version: 1.0.0
 # Import
 # ============================================================================
 
-from datetime import datetime
-from fastapi import FastAPI, HTTPException, Depends, Response
+import asyncio
+from contextlib import asynccontextmanager
+from datetime import datetime, timezone
+from functools import lru_cache
+from fastapi import FastAPI, HTTPException, Depends, Request, Response
 from fastapi.middleware.cors import CORSMiddleware
-from typing import List, Optional
-from supabase_client import get_supabase_client
-from supabase import Client
+from fastapi.responses import ORJSONResponse
+from typing import Awaitable, List, Optional
+from supabase_client import create_http_client, get_async_supabase_client
+from supabase import AsyncClient
+from cachetools import TTLCache
+import atexit
 import logging
-import json
+import os
+import queue
+import time
+from logging.handlers import QueueHandler, QueueListener
+import orjson
 import uvicorn
 from models import (
     Product, ProductCreate, ProductUpdate,
@@ -37,52 +47,179 @@ from models import (
 # Application Configuration
 # ============================================================================
 
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """
+    애플리케이션 수명 주기 관리
+    
+    시작 시 비동기 Supabase 클라이언트를 한 번 생성하여 모든 요청에서 재사용하고,
+    종료 시 공유 HTTP 커넥션 풀을 닫습니다.
+    """
+    http_client = create_http_client()
+    try:
+        app.state.supabase = await get_async_supabase_client(http_client)
+        
+        # 연결 확인 (커넥션 풀 예열)
+        try:
+            await app.state.supabase.table("products").select("id").limit(1).execute()
+        except Exception as e:
+            logger.warning("Supabase 연결 확인 실패: %s", e)
+        
+        yield
+    finally:
+        await http_client.aclose()
+
 app = FastAPI(
     title="Shop API",
     description="Supabase 기반 E-Commerce API",
     version="1.0.0",
+    default_response_class=ORJSONResponse,
+    lifespan=lifespan,
 )
 
-# 로깅 설정
+# 통합 API URL 설정
+API_BASE_URL = os.getenv("API_BASE_URL", "http://localhost:8001/api")
+API_URL_PREFIXES = tuple(
+    (key, f"{API_BASE_URL}/{action}/")
+    for key, action in (
+        ("get", "get"),
+        ("favorite", "favorite"),
+        ("cart_add", "cart-add"),
+        ("cart_remove", "cart-remove"),
+        ("cart_update", "cart-update"),
+    )
+)
+
+# 조회 컬럼 (format_product_data 및 응답에 필요한 컬럼만 조회)
+PRODUCT_COLUMNS = "id, brand_name, product_name, image_url, price, discount, likes, reviews, is_favorite, category"
+CART_ITEM_COLUMNS = f"id, user_id, quantity, products:product_id ({PRODUCT_COLUMNS})"
+
+# 랭킹 응답 캐시 (워커 프로세스마다 따로 존재)
+# 즐겨찾기 토글 시의 무효화는 해당 요청을 처리한 워커에만 적용되므로, 다른 워커의 지연이
+# 최대 5초를 넘지 않도록 TTL 을 짧게 유지합니다. 사용자가 직접 바꾼 결과가 바로 보여야 하는
+# 즐겨찾기 목록은 캐시하지 않습니다.
+products_ranking_cache: TTLCache = TTLCache(maxsize=1, ttl=5)
+
+# 랭킹 캐시 버전 (즐겨찾기 변경 시 증가, 조회 중 무효화된 결과의 캐시 저장 방지)
+ranking_cache_version: int = 0
+
+# 응답 헤더 타임스탬프 캐시 ([포맷된 문자열, 기준 epoch 초])
+response_timestamp_cache: list = ["", 0]
+
+# 인기 검색어 목록 (임시로 하드코딩)
+POPULAR_SEARCH_TERMS = [
+    {"term": "나이키", "count": 156, "trend": "up"},
+    {"term": "아디다스", "count": 134, "trend": "up"},
+    {"term": "반팔티", "count": 98, "trend": "down"},
+    {"term": "청바지", "count": 87, "trend": "up"},
+    {"term": "운동화", "count": 76, "trend": "up"},
+    {"term": "후드티", "count": 65, "trend": "down"},
+    {"term": "가방", "count": 54, "trend": "up"},
+    {"term": "시계", "count": 43, "trend": "up"},
+    {"term": "신발", "count": 38, "trend": "down"},
+    {"term": "액세서리", "count": 32, "trend": "up"}
+]
+
+# 로깅 설정 (요청 처리 중에는 큐에 넣기만 하고, 출력은 백그라운드 스레드에서 처리)
+log_queue: queue.Queue = queue.Queue(-1)
+log_stream_handler = logging.StreamHandler()
+log_stream_handler.setFormatter(
+    logging.Formatter('%(asctime)s - %(name)s - %(levelname)s - %(message)s')
+)
+log_listener = QueueListener(log_queue, log_stream_handler, respect_handler_level=True)
+log_listener.start()
+atexit.register(log_listener.stop)
+
 logging.basicConfig(
-    level=logging.INFO,
-    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s'
+    level=os.getenv("LOG_LEVEL", "INFO").upper(),
+    handlers=[QueueHandler(log_queue)]
 )
 logger = logging.getLogger(__name__)
 
-# CORS 설정 
+# CORS 설정 (허용 오리진은 CORS_ORIGINS 에 콤마로 구분하여 지정, preflight 결과 1일 캐싱)
+CORS_ORIGINS = [
+    origin.strip()
+    for origin in os.getenv("CORS_ORIGINS", "http://localhost:3000,http://localhost:8080").split(",")
+    if origin.strip()
+]
+
 app.add_middleware(
     CORSMiddleware,
-    allow_origins=["*"],
-    allow_credentials=True,
+    allow_origins=CORS_ORIGINS,
     allow_methods=["GET", "POST", "PUT", "DELETE", "OPTIONS"],
     allow_headers=["*"],
+    max_age=86400,
 )
 
 # ============================================================================
 # Dependency Injection
 # ============================================================================
 
-def get_supabase() -> Client:
+def get_supabase(request: Request) -> AsyncClient:
     """
     Supabase 클라이언트 의존성 주입
     
+    Args:
+        request: 현재 요청 (앱 상태의 클라이언트 조회용)
+        
     Returns:
-        Client: Supabase 클라이언트 인스턴스
+        AsyncClient: 시작 시 생성된 비동기 Supabase 클라이언트
         
     Raises:
         HTTPException: 데이터베이스 연결 실패 시
     """
-    try:
-        return get_supabase_client()
-    except Exception as e:
-        logger.error(f"Supabase 연결 실패: {str(e)}")
+    supabase = getattr(request.app.state, "supabase", None)
+    if supabase is None:
+        logger.error("Supabase 연결 실패: 클라이언트가 초기화되지 않았습니다")
         raise HTTPException(status_code=500, detail="데이터베이스 연결 실패")
+    return supabase
 
 # ============================================================================
 # Utility Functions
 # ============================================================================
 
+@lru_cache(maxsize=4096)
+def format_price(price: int) -> str:
+    """
+    가격 문자열 포맷팅 (천 단위 콤마, 결과 캐싱)
+    
+    Args:
+        price: 가격
+        
+    Returns:
+        str: 포맷팅된 가격 (예: "39,000원")
+    """
+    return f"{price:,}원"
+
+@lru_cache(maxsize=128)
+def format_discount(discount: int) -> str:
+    """
+    할인율 문자열 포맷팅 (결과 캐싱)
+    
+    Args:
+        discount: 할인율
+        
+    Returns:
+        str: 포맷팅된 할인율 (예: "20%")
+    """
+    return f"{discount}%"
+
+@lru_cache(maxsize=8192)
+def build_api_urls(product_id: int) -> dict:
+    """
+    상품별 통합 API URL 생성 (상품 ID 기준 캐싱, 반환값은 수정하지 않음)
+    
+    Args:
+        product_id: 상품 ID
+        
+    Returns:
+        dict: 액션별 API URL
+    """
+    return {
+        key: f"{prefix}{product_id}"
+        for key, prefix in API_URL_PREFIXES
+    }
+
 def format_product_data(products: List[dict]) -> List[dict]:
     """
     상품 데이터 포맷팅 및 API URL 생성
@@ -94,27 +231,53 @@ def format_product_data(products: List[dict]) -> List[dict]:
         List[dict]: 포맷팅된 상품 데이터 (가격, 할인율, API URLs 포함)
     """
     for product in products:
-        product_id = product['id']
-        
         # 가격 포맷팅 (천 단위 콤마)
-        price = int(product['price']) if isinstance(product['price'], (int, float)) else int(product['price'])
-        product['price'] = f"{price:,}원"
+        product['price'] = format_price(product['price'])
         
         # 할인율 포맷팅 (퍼센트)
-        discount = int(product['discount']) if isinstance(product['discount'], (int, float)) else int(product['discount'])
-        product['discount'] = f"{discount}%"
-        
-        # API URLs 생성
-        product['api_urls'] = {
-            "get": f"http://localhost:8001/api/get/{product_id}",
-            "favorite": f"http://localhost:8001/api/favorite/{product_id}",
-            "cart_add": f"http://localhost:8001/api/cart-add/{product_id}",
-            "cart_remove": f"http://localhost:8001/api/cart-remove/{product_id}",
-            "cart_update": f"http://localhost:8001/api/cart-update/{product_id}"
-        }
+        product['discount'] = format_discount(product['discount'])
+        
+        # API URLs 생성 (상품 ID 별 캐시)
+        product['api_urls'] = build_api_urls(product['id'])
     
     return products
 
+async def gather_optional(*awaitables: Optional[Awaitable]) -> list:
+    """
+    None 이 아닌 작업만 병렬 실행
+    
+    Args:
+        awaitables: 실행할 작업 (None 이면 건너뜀)
+        
+    Returns:
+        list: 입력과 같은 위치의 결과 (건너뛴 작업은 None)
+    """
+    results = iter(await asyncio.gather(*(a for a in awaitables if a is not None)))
+    return [None if a is None else next(results) for a in awaitables]
+
+def invalidate_ranking_cache() -> None:
+    """
+    즐겨찾기/좋아요 변경 시 랭킹 캐시 무효화 (현재 워커)
+    
+    버전을 함께 증가시켜, 무효화 이전에 시작된 조회가 이전 결과를 다시 저장하지 못하게 합니다.
+    """
+    global ranking_cache_version
+    ranking_cache_version += 1
+    products_ranking_cache.clear()
+
+def get_response_timestamp() -> str:
+    """
+    응답 헤더용 UTC 타임스탬프 (초 단위로 캐싱하여 재사용)
+    
+    Returns:
+        str: ISO 8601 UTC 시각 (예: "2024-01-01T00:00:00Z")
+    """
+    now = int(time.time())
+    if now != response_timestamp_cache[1]:
+        response_timestamp_cache[0] = datetime.fromtimestamp(now, timezone.utc).strftime("%Y-%m-%dT%H:%M:%SZ")
+        response_timestamp_cache[1] = now
+    return response_timestamp_cache[0]
+
 def create_standard_response(data: any, message: str = "Success") -> Response:
     """
     API 응답 생성
@@ -130,7 +293,7 @@ def create_standard_response(data: any, message: str = "Success") -> Response:
         "header": {
             "content-type": "application/json; charset=utf-8",
             "server": "FastAPI",
-            "date": datetime.now().isoformat() + "Z"
+            "date": get_response_timestamp()
         },
         "body": {
             "code": "200",
@@ -139,11 +302,9 @@ def create_standard_response(data: any, message: str = "Success") -> Response:
         }
     }
     
-    json_str = json.dumps(response_data, ensure_ascii=False, indent=2)
     return Response(
-        content=json_str,
-        media_type="application/json; charset=utf-8",
-        headers={"Content-Type": "application/json; charset=utf-8"}
+        content=orjson.dumps(response_data, option=orjson.OPT_NON_STR_KEYS),
+        media_type="application/json; charset=utf-8"
     )
 
 # ============================================================================
@@ -169,7 +330,7 @@ async def get_products(
     offset: int = 0,
     limit: int = 20,
     category: Optional[str] = None,
-    supabase: Client = Depends(get_supabase)
+    supabase: AsyncClient = Depends(get_supabase)
 ):
     """
     상품 목록 조회 (페이지네이션 지원)
@@ -187,30 +348,30 @@ async def get_products(
         HTTPException: 데이터베이스 조회 실패 시
     """
     try:
-        logger.info(f"상품 목록 조회 - offset: {offset}, limit: {limit}, category: {category}")
+        logger.info("상품 목록 조회 - offset: %s, limit: %s, category: %s", offset, limit, category)
         
-        query = supabase.table("products").select("*")
+        query = supabase.table("products").select(PRODUCT_COLUMNS)
         
         # 카테고리 필터링
         if category and category != "전체":
             query = query.eq("category", category)
         
         # 페이지네이션 및 정렬
-        response = query.order("created_at", desc=True).range(offset, offset + limit - 1).execute()
+        response = await query.order("created_at", desc=True).range(offset, offset + limit - 1).execute()
         
         # 데이터 포맷팅
         formatted_products = format_product_data(response.data)
         
-        logger.info(f"상품 목록 조회 성공 - {len(formatted_products)}개 상품 반환")
+        logger.info("상품 목록 조회 성공 - %s개 상품 반환", len(formatted_products))
         
         return create_standard_response(formatted_products)
         
     except Exception as e:
-        logger.error(f"상품 목록 조회 실패: {str(e)}")
+        logger.error("상품 목록 조회 실패: %s", e)
         raise HTTPException(status_code=500, detail=str(e))
 
 @app.get("/products/all")
-async def get_all_products(supabase: Client = Depends(get_supabase)):
+async def get_all_products(supabase: AsyncClient = Depends(get_supabase)):
     """
     전체 상품 조회 (페이지네이션 없음)
     
@@ -222,20 +383,20 @@ async def get_all_products(supabase: Client = Depends(get_supabase)):
     """
     try:
         logger.info("전체 상품 조회 요청")
-        response = supabase.table("products").select("*").order("created_at", desc=True).execute()
+        response = await supabase.table("products").select(PRODUCT_COLUMNS).order("created_at", desc=True).execute()
         
         formatted_products = format_product_data(response.data)
         
-        logger.info(f"전체 상품 조회 성공 - {len(formatted_products)}개 상품")
+        logger.info("전체 상품 조회 성공 - %s개 상품", len(formatted_products))
         
         return create_standard_response(formatted_products)
         
     except Exception as e:
-        logger.error(f"전체 상품 조회 실패: {str(e)}")
+        logger.error("전체 상품 조회 실패: %s", e)
         raise HTTPException(status_code=500, detail=str(e))
 
 @app.get("/products/{product_id}")
-async def get_product(product_id: int, supabase: Client = Depends(get_supabase)):
+async def get_product(product_id: int, supabase: AsyncClient = Depends(get_supabase)):
     """
     특정 상품 상세 정보 조회
     
@@ -250,25 +411,25 @@ async def get_product(product_id: int, supabase: Client = Depends(get_supabase))
         HTTPException: 상품을 찾을 수 없을 때 (404)
     """
     try:
-        logger.info(f"상품 상세 조회 - product_id: {product_id}")
+        logger.info("상품 상세 조회 - product_id: %s", product_id)
         
-        response = supabase.table("products").select("*").eq("id", product_id).execute()
+        response = await supabase.table("products").select(PRODUCT_COLUMNS).eq("id", product_id).execute()
         
         if not response.data:
-            logger.warning(f"상품을 찾을 수 없음 - product_id: {product_id}")
+            logger.warning("상품을 찾을 수 없음 - product_id: %s", product_id)
             raise HTTPException(status_code=404, detail="상품을 찾을 수 없습니다")
         
         product = response.data[0]
         formatted_products = format_product_data([product])
         
-        logger.info(f"상품 상세 조회 성공 - {product['brand_name']} - {product['product_name']}")
+        logger.info("상품 상세 조회 성공 - %s - %s", product['brand_name'], product['product_name'])
         
         return create_standard_response(formatted_products[0])
         
     except HTTPException:
         raise
     except Exception as e:
-        logger.error(f"상품 상세 조회 실패: {str(e)}")
+        logger.error("상품 상세 조회 실패: %s", e)
         raise HTTPException(status_code=500, detail=str(e))
 
 # ============================================================================
@@ -281,7 +442,7 @@ async def unified_product_api(
     product_id: int, 
     user_id: int = 1, 
     quantity: int = 1,
-    supabase: Client = Depends(get_supabase)
+    supabase: AsyncClient = Depends(get_supabase)
 ):
     """
     통합 상품 API
@@ -310,55 +471,47 @@ async def unified_product_api(
         HTTPException: 잘못된 액션 또는 데이터베이스 오류 시
     """
     try:
-        logger.info(f"통합 API 호출 - action: {action}, product_id: {product_id}")
+        logger.info("통합 API 호출 - action: %s, product_id: %s", action, product_id)
         
         message = ""
+        product = None
+        cart_quantity = None
         
         # 액션별 비즈니스 로직 처리
         if action == "favorite":
-            # 즐겨찾기 토글 로직
-            current = supabase.table("products").select("is_favorite, likes").eq("id", product_id).execute()
-            if not current.data:
+            # 즐겨찾기 토글 로직 (RPC 한 번으로 토글 + 좋아요 수 갱신)
+            toggled = await supabase.rpc("toggle_favorite", {"p_id": product_id}).select(PRODUCT_COLUMNS).execute()
+            if not toggled.data:
                 raise HTTPException(status_code=404, detail="상품을 찾을 수 없습니다")
             
-            current_favorite = current.data[0]["is_favorite"]
-            current_likes = int(current.data[0]["likes"] or "0")
-            new_favorite = not current_favorite
-            new_likes = current_likes + (1 if new_favorite else -1)
-            new_likes = max(0, new_likes)
-            
-            supabase.table("products").update({
-                "is_favorite": new_favorite,
-                "likes": str(new_likes)
-            }).eq("id", product_id).execute()
-            
-            message = "즐겨찾기가 토글되었습니다" if new_favorite else "즐겨찾기가 해제되었습니다"
+            product = toggled.data[0]
+            invalidate_ranking_cache()
+            message = "즐겨찾기가 토글되었습니다" if product["is_favorite"] else "즐겨찾기가 해제되었습니다"
             
         elif action == "cart-add":
-            # 장바구니 추가 로직
-            existing = supabase.table("cart_items").select("*").eq("user_id", user_id).eq("product_id", product_id).execute()
-            if existing.data:
-                current_qty = existing.data[0]["quantity"]
-                new_qty = current_qty + quantity
-                supabase.table("cart_items").update({"quantity": new_qty}).eq("user_id", user_id).eq("product_id", product_id).execute()
+            # 장바구니 추가 로직 (RPC upsert 로 수량 누적)
+            added = await supabase.rpc("add_to_cart", {
+                "p_user_id": user_id,
+                "p_product_id": product_id,
+                "p_quantity": quantity
+            }).execute()
+            new_qty = added.data[0]["quantity"]
+            cart_quantity = max(0, new_qty)
+            if new_qty != quantity:
                 message = f"장바구니 수량이 {new_qty}개로 업데이트되었습니다"
             else:
-                supabase.table("cart_items").insert({
-                    "user_id": user_id,
-                    "product_id": product_id,
-                    "quantity": quantity,
-                    "selected_options": ""
-                }).execute()
                 message = "장바구니에 추가되었습니다"
                 
         elif action == "cart-remove":
             # 장바구니 삭제 로직
-            supabase.table("cart_items").delete().eq("user_id", user_id).eq("product_id", product_id).execute()
+            await supabase.table("cart_items").delete().eq("user_id", user_id).eq("product_id", product_id).execute()
+            cart_quantity = 0
             message = "장바구니에서 삭제되었습니다"
             
         elif action == "cart-update":
             # 장바구니 수량 변경 로직
-            supabase.table("cart_items").update({"quantity": quantity}).eq("user_id", user_id).eq("product_id", product_id).execute()
+            updated = await supabase.table("cart_items").update({"quantity": quantity}).eq("user_id", user_id).eq("product_id", product_id).execute()
+            cart_quantity = max(0, quantity) if updated.data else 0
             message = f"수량이 {quantity}개로 변경되었습니다"
             
         elif action == "get":
@@ -367,20 +520,30 @@ async def unified_product_api(
         else:
             raise HTTPException(status_code=400, detail=f"지원하지 않는 액션: {action}")
         
-        # 최신 상품 정보 조회
-        product_response = supabase.table("products").select("*").eq("id", product_id).execute()
-        if not product_response.data:
-            raise HTTPException(status_code=404, detail="상품을 찾을 수 없습니다")
+        # 액션 결과로 알 수 없는 정보만 조회 (상품: 즐겨찾기 외, 장바구니 상태: 장바구니 액션 외)
+        product_task = None
+        if product is None:
+            product_task = supabase.table("products").select(PRODUCT_COLUMNS).eq("id", product_id).execute()
+        
+        cart_task = None
+        if cart_quantity is None:
+            cart_task = supabase.table("cart_items").select("quantity").eq("user_id", user_id).eq("product_id", product_id).gt("quantity", 0).execute()
+        
+        product_response, cart_response = await gather_optional(product_task, cart_task)
+        
+        if product_response is not None:
+            if not product_response.data:
+                raise HTTPException(status_code=404, detail="상품을 찾을 수 없습니다")
+            product = product_response.data[0]
+        
+        if cart_response is not None:
+            cart_quantity = cart_response.data[0]['quantity'] if cart_response.data else 0
         
-        product = product_response.data[0]
         formatted_products = format_product_data([product])
         
-        # 장바구니 상태 조회
-        cart_response = supabase.table("cart_items").select("*").eq("user_id", user_id).eq("product_id", product_id).gt("quantity", 0).execute()
-        in_cart = len(cart_response.data) > 0
-        cart_quantity = cart_response.data[0]['quantity'] if cart_response.data else 0
+        in_cart = cart_quantity > 0
         
-        logger.info(f"통합 API 성공 - {action} 완료")
+        logger.info("통합 API 성공 - %s 완료", action)
         
         # 통일된 응답 구조
         response_data = {
@@ -388,7 +551,7 @@ async def unified_product_api(
             "is_favorite": product.get('is_favorite', False),
             "in_cart": in_cart,
             "cart_quantity": cart_quantity,
-            "likes": int(product.get('likes', 0))
+            "likes": product.get('likes') or 0
         }
         
         return create_standard_response(response_data, message)
@@ -396,7 +559,7 @@ async def unified_product_api(
     except HTTPException:
         raise
     except Exception as e:
-        logger.error(f"통합 API 실패 - {action}: {str(e)}")
+        logger.error("통합 API 실패 - %s: %s", action, e)
         raise HTTPException(status_code=500, detail=str(e))
 
 # ============================================================================
@@ -404,7 +567,7 @@ async def unified_product_api(
 # ============================================================================
 
 @app.get("/user/cart-and-favorites")
-async def get_user_cart_and_favorites(user_id: int = 1, supabase: Client = Depends(get_supabase)):
+async def get_user_cart_and_favorites(user_id: int = 1, supabase: AsyncClient = Depends(get_supabase)):
     """
     사용자의 장바구니와 즐겨찾기 목록을 한 번에 조회
     
@@ -416,32 +579,32 @@ async def get_user_cart_and_favorites(user_id: int = 1, supabase: Client = Depen
         Response: 사용자의 장바구니와 즐겨찾기 데이터
     """
     try:
-        logger.info(f"사용자 데이터 조회 - user_id: {user_id}")
+        logger.info("사용자 데이터 조회 - user_id: %s", user_id)
         
-        # 장바구니 조회
-        cart_response = supabase.table("cart_items").select("""
-            *,
-            products:product_id (*)
-        """).eq("user_id", user_id).gt("quantity", 0).execute()
+        # 장바구니 및 즐겨찾기 병렬 조회
+        cart_query = supabase.table("cart_items").select(CART_ITEM_COLUMNS).eq("user_id", user_id).gt("quantity", 0)
+        favorites_query = supabase.table("products").select(PRODUCT_COLUMNS).eq("is_favorite", True)
         
-        # 즐겨찾기 조회
-        favorites_response = supabase.table("products").select("*").eq("is_favorite", True).execute()
+        cart_response, favorites_response = await asyncio.gather(
+            cart_query.execute(),
+            favorites_query.execute()
+        )
         
         # 데이터 포맷팅
-        cart_items = []
-        for item in cart_response.data:
-            if item.get('products'):
-                product = item['products'].copy()
-                formatted_products = format_product_data([product])
-                cart_items.append({
-                    "cart_item_id": item['id'],
-                    "quantity": item['quantity'],
-                    "product": formatted_products[0]
-                })
+        cart_rows = [item for item in cart_response.data if item.get('products')]
+        cart_products = format_product_data([item['products'] for item in cart_rows])
+        cart_items = [
+            {
+                "cart_item_id": item['id'],
+                "quantity": item['quantity'],
+                "product": product
+            }
+            for item, product in zip(cart_rows, cart_products)
+        ]
         
         favorites = format_product_data(favorites_response.data)
         
-        logger.info(f"사용자 데이터 조회 성공 - 장바구니: {len(cart_items)}개, 즐겨찾기: {len(favorites)}개")
+        logger.info("사용자 데이터 조회 성공 - 장바구니: %s개, 즐겨찾기: %s개", len(cart_items), len(favorites))
         
         response_data = {
             "user_id": user_id,
@@ -454,7 +617,46 @@ async def get_user_cart_and_favorites(user_id: int = 1, supabase: Client = Depen
         return create_standard_response(response_data)
         
     except Exception as e:
-        logger.error(f"사용자 데이터 조회 실패: {str(e)}")
+        logger.error("사용자 데이터 조회 실패: %s", e)
+        raise HTTPException(status_code=500, detail=str(e))
+
+@app.get("/user/counts")
+async def get_user_counts(user_id: int = 1, supabase: AsyncClient = Depends(get_supabase)):
+    """
+    사용자의 장바구니/즐겨찾기 개수만 조회 (배지 표시용)
+    
+    행 데이터 없이 PostgREST 의 count=exact 결과만 받아옵니다.
+    
+    Args:
+        user_id: 사용자 ID (기본값: 1)
+        supabase: Supabase 클라이언트
+        
+    Returns:
+        Response: 장바구니 및 즐겨찾기 개수
+    """
+    try:
+        logger.info("사용자 개수 조회 - user_id: %s", user_id)
+        
+        cart_query = supabase.table("cart_items").select("id", count="exact", head=True).eq("user_id", user_id).gt("quantity", 0)
+        favorites_query = supabase.table("products").select("id", count="exact", head=True).eq("is_favorite", True)
+        
+        cart_response, favorites_response = await asyncio.gather(
+            cart_query.execute(),
+            favorites_query.execute()
+        )
+        
+        response_data = {
+            "user_id": user_id,
+            "cart_count": cart_response.count or 0,
+            "favorites_count": favorites_response.count or 0
+        }
+        
+        logger.info("사용자 개수 조회 성공 - 장바구니: %s개, 즐겨찾기: %s개", response_data['cart_count'], response_data['favorites_count'])
+        
+        return create_standard_response(response_data)
+        
+    except Exception as e:
+        logger.error("사용자 개수 조회 실패: %s", e)
         raise HTTPException(status_code=500, detail=str(e))
 
 # ============================================================================
@@ -462,7 +664,7 @@ async def get_user_cart_and_favorites(user_id: int = 1, supabase: Client = Depen
 # ============================================================================
 
 @app.get("/products-favorites")
-async def get_favorite_products(supabase: Client = Depends(get_supabase)):
+async def get_favorite_products(supabase: AsyncClient = Depends(get_supabase)):
     """
     즐겨찾기 상품 조회
     
@@ -474,20 +676,21 @@ async def get_favorite_products(supabase: Client = Depends(get_supabase)):
     """
     try:
         logger.info("즐겨찾기 상품 조회")
-        response = supabase.table("products").select("*").eq("is_favorite", True).order("created_at", desc=True).execute()
+        
+        response = await supabase.table("products").select(PRODUCT_COLUMNS).eq("is_favorite", True).order("created_at", desc=True).execute()
         
         formatted_products = format_product_data(response.data)
         
-        logger.info(f"즐겨찾기 상품 조회 성공 - {len(formatted_products)}개 상품")
+        logger.info("즐겨찾기 상품 조회 성공 - %s개 상품", len(formatted_products))
         
         return create_standard_response(formatted_products)
         
     except Exception as e:
-        logger.error(f"즐겨찾기 상품 조회 실패: {str(e)}")
+        logger.error("즐겨찾기 상품 조회 실패: %s", e)
         raise HTTPException(status_code=500, detail=str(e))
 
 @app.get("/cart-items")
-async def get_cart_items(user_id: Optional[int] = None, supabase: Client = Depends(get_supabase)):
+async def get_cart_items(user_id: Optional[int] = None, supabase: AsyncClient = Depends(get_supabase)):
     """
     장바구니 아이템 조회
     
@@ -499,37 +702,34 @@ async def get_cart_items(user_id: Optional[int] = None, supabase: Client = Depen
         Response: 장바구니 아이템 목록
     """
     try:
-        logger.info(f"장바구니 아이템 조회 - user_id: {user_id}")
+        logger.info("장바구니 아이템 조회 - user_id: %s", user_id)
         
-        query = supabase.table("cart_items").select("""
-            *,
-            products:product_id (*)
-        """).gt("quantity", 0)
+        query = supabase.table("cart_items").select(CART_ITEM_COLUMNS).gt("quantity", 0)
         
         if user_id:
             query = query.eq("user_id", user_id)
             
-        response = query.order("created_at", desc=True).execute()
+        response = await query.order("created_at", desc=True).execute()
         
         # 상품 정보 포맷팅
-        cart_items = []
-        for item in response.data:
-            if item.get('products'):
-                product = item['products'].copy()
-                formatted_products = format_product_data([product])
-                cart_items.append({
-                    "cart_item_id": item['id'],
-                    "quantity": item['quantity'],
-                    "user_id": item['user_id'],
-                    "product": formatted_products[0]
-                })
-        
-        logger.info(f"장바구니 아이템 조회 성공 - {len(cart_items)}개 아이템")
+        cart_rows = [item for item in response.data if item.get('products')]
+        cart_products = format_product_data([item['products'] for item in cart_rows])
+        cart_items = [
+            {
+                "cart_item_id": item['id'],
+                "quantity": item['quantity'],
+                "user_id": item['user_id'],
+                "product": product
+            }
+            for item, product in zip(cart_rows, cart_products)
+        ]
+        
+        logger.info("장바구니 아이템 조회 성공 - %s개 아이템", len(cart_items))
         
         return create_standard_response(cart_items)
         
     except Exception as e:
-        logger.error(f"장바구니 아이템 조회 실패: {str(e)}")
+        logger.error("장바구니 아이템 조회 실패: %s", e)
         raise HTTPException(status_code=500, detail=str(e))
 
 # ============================================================================
@@ -537,7 +737,7 @@ async def get_cart_items(user_id: Optional[int] = None, supabase: Client = Depen
 # ============================================================================
 
 @app.get("/products-recent-views")
-async def get_recent_viewed_products(user_id: int = 1, limit: int = 50, supabase: Client = Depends(get_supabase)):
+async def get_recent_viewed_products(user_id: int = 1, limit: int = 50, supabase: AsyncClient = Depends(get_supabase)):
     """
     사용자가 최근에 조회한 상품 조회
     
@@ -550,34 +750,26 @@ async def get_recent_viewed_products(user_id: int = 1, limit: int = 50, supabase
         Response: 최근 조회한 상품 목록
     """
     try:
-        logger.info(f"최근 조회 상품 조회 - user_id: {user_id}, limit: {limit}")
+        logger.info("최근 조회 상품 조회 - user_id: %s, limit: %s", user_id, limit)
         
         # quantity가 0인 기록들 (조회 기록)을 최근 순으로 가져오기
-        response = supabase.table("cart_items").select("""
-            *,
-            products:product_id (*)
-        """).eq("user_id", user_id).eq("quantity", 0).order("updated_at", desc=True).limit(limit).execute()
+        response = await supabase.table("cart_items").select(CART_ITEM_COLUMNS).eq("user_id", user_id).eq("quantity", 0).order("updated_at", desc=True).limit(limit).execute()
         
         # 상품 정보만 추출
-        products = []
-        for item in response.data:
-            if 'products' in item and item['products']:
-                product = item['products'].copy()
-                formatted_products = format_product_data([product])
-                products.append(formatted_products[0])
+        products = format_product_data([item['products'] for item in response.data if item.get('products')])
         
         # 최근 조회 데이터가 없으면 전체 상품에서 일부 반환
         if not products:
             logger.info("최근 조회 데이터 없음 - 전체 상품에서 일부 반환 (테스트용)")
-            all_products_response = supabase.table("products").select("*").order("created_at", desc=True).limit(limit).execute()
+            all_products_response = await supabase.table("products").select(PRODUCT_COLUMNS).order("created_at", desc=True).limit(limit).execute()
             products = format_product_data(all_products_response.data)
         
-        logger.info(f"최근 조회 상품 조회 성공 - {len(products)}개 상품")
+        logger.info("최근 조회 상품 조회 성공 - %s개 상품", len(products))
         
         return create_standard_response(products)
         
     except Exception as e:
-        logger.error(f"최근 조회 상품 조회 실패: {str(e)}")
+        logger.error("최근 조회 상품 조회 실패: %s", e)
         raise HTTPException(status_code=500, detail=str(e))
 
 # ============================================================================
@@ -585,7 +777,7 @@ async def get_recent_viewed_products(user_id: int = 1, limit: int = 50, supabase
 # ============================================================================
 
 @app.get("/popular-search-terms")
-async def get_popular_search_terms(limit: int = 10, supabase: Client = Depends(get_supabase)):
+async def get_popular_search_terms(limit: int = 10, supabase: AsyncClient = Depends(get_supabase)):
     """
     인기 검색어 조회
     
@@ -597,35 +789,21 @@ async def get_popular_search_terms(limit: int = 10, supabase: Client = Depends(g
         Response: 인기 검색어 목록
     """
     try:
-        logger.info(f"인기 검색어 조회 - limit: {limit}")
-        
-        # 인기 검색어 목록 (임시로 하드코딩)
-        popular_terms = [
-            {"term": "나이키", "count": 156, "trend": "up"},
-            {"term": "아디다스", "count": 134, "trend": "up"},
-            {"term": "반팔티", "count": 98, "trend": "down"},
-            {"term": "청바지", "count": 87, "trend": "up"},
-            {"term": "운동화", "count": 76, "trend": "up"},
-            {"term": "후드티", "count": 65, "trend": "down"},
-            {"term": "가방", "count": 54, "trend": "up"},
-            {"term": "시계", "count": 43, "trend": "up"},
-            {"term": "신발", "count": 38, "trend": "down"},
-            {"term": "액세서리", "count": 32, "trend": "up"}
-        ]
+        logger.info("인기 검색어 조회 - limit: %s", limit)
         
         # limit만큼 반환
-        result = popular_terms[:limit]
+        result = POPULAR_SEARCH_TERMS[:limit]
         
-        logger.info(f"인기 검색어 조회 성공 - {len(result)}개 검색어")
+        logger.info("인기 검색어 조회 성공 - %s개 검색어", len(result))
         
         return create_standard_response(result)
         
     except Exception as e:
-        logger.error(f"인기 검색어 조회 실패: {str(e)}")
+        logger.error("인기 검색어 조회 실패: %s", e)
         raise HTTPException(status_code=500, detail=str(e))
 
 @app.get("/products-search")
-async def search_products(q: str, supabase: Client = Depends(get_supabase)):
+async def search_products(q: str, supabase: AsyncClient = Depends(get_supabase)):
     """
     상품 검색
     
@@ -637,25 +815,24 @@ async def search_products(q: str, supabase: Client = Depends(get_supabase)):
         Response: 검색 결과 상품 목록
     """
     try:
-        logger.info(f"상품 검색 - 검색어: '{q}'")
+        logger.info("상품 검색 - 검색어: '%s'", q)
 
         q = (q or "").strip()
         if not q:
             logger.info("빈 검색어 요청 - 빈 목록 반환")
             return create_standard_response([], "검색어가 비어있습니다")
         
-        response = supabase.table("products").select("*").or_(
-            f"product_name.ilike.%{q}%,brand_name.ilike.%{q}%"
-        ).order("created_at", desc=True).execute()
+        # 상품명/브랜드명 검색 RPC (3글자 이상: pg_trgm 부분 일치, 1~2글자: 단어 접두어 일치)
+        response = await supabase.rpc("search_products", {"q": q}).select(PRODUCT_COLUMNS).execute()
         
         formatted_products = format_product_data(response.data)
         
-        logger.info(f"상품 검색 성공 - '{q}'에 대한 {len(formatted_products)}개 결과")
+        logger.info("상품 검색 성공 - '%s'에 대한 %s개 결과", q, len(formatted_products))
         
         return create_standard_response(formatted_products)
         
     except Exception as e:
-        logger.error(f"상품 검색 실패: {str(e)}")
+        logger.error("상품 검색 실패: %s", e)
         raise HTTPException(status_code=500, detail=str(e))
 
 # ============================================================================
@@ -663,7 +840,7 @@ async def search_products(q: str, supabase: Client = Depends(get_supabase)):
 # ============================================================================
 
 @app.get("/products-ranking")
-async def get_products_ranking(supabase: Client = Depends(get_supabase)):
+async def get_products_ranking(supabase: AsyncClient = Depends(get_supabase)):
     """
     인기 상품 랭킹 조회 (좋아요 수 기준)
     Args:
@@ -674,16 +851,21 @@ async def get_products_ranking(supabase: Client = Depends(get_supabase)):
     """
     try:
         logger.info("상품 랭킹 조회")
-        response = supabase.table("products").select("*").order("likes", desc=True).limit(20).execute()
         
-        formatted_products = format_product_data(response.data)
+        formatted_products = products_ranking_cache.get("ranking")
+        if formatted_products is None:
+            cache_version = ranking_cache_version
+            response = await supabase.table("products").select(PRODUCT_COLUMNS).order("likes", desc=True).limit(20).execute()
+            formatted_products = format_product_data(response.data)
+            if cache_version == ranking_cache_version:
+                products_ranking_cache["ranking"] = formatted_products
         
-        logger.info(f"상품 랭킹 조회 성공 - {len(formatted_products)}개 상품")
+        logger.info("상품 랭킹 조회 성공 - %s개 상품", len(formatted_products))
         
         return create_standard_response(formatted_products)
         
     except Exception as e:
-        logger.error(f"상품 랭킹 조회 실패: {str(e)}")
+        logger.error("상품 랭킹 조회 실패: %s", e)
         raise HTTPException(status_code=500, detail=str(e))
 
 # ============================================================================
@@ -693,11 +875,21 @@ async def get_products_ranking(supabase: Client = Depends(get_supabase)):
 if __name__ == "__main__":
     """
     서버 실행
+    
+    운영: WEB_CONCURRENCY 개의 워커 (기본값: CPU 코어 수)
+    개발: DEV=1 설정 시 단일 워커 + 코드 변경 자동 재시작
+    
+    loop/http 는 "auto" 로 두어 uvicorn[standard] 설치 시 uvloop + httptools 를,
+    사용할 수 없는 환경(예: Windows 의 uvloop)에서는 기본 구현을 사용합니다.
     """
+    dev_mode = os.getenv("DEV") == "1"
     uvicorn.run(
         "main:app",
         host="0.0.0.0", 
         port=8001, 
         log_level="info",
-        reload=True
+        loop="auto",
+        http="auto",
+        reload=dev_mode,
+        workers=None if dev_mode else int(os.getenv("WEB_CONCURRENCY", os.cpu_count() or 1))
     )
\ No newline at end of file
@@ -7,9 +7,9 @@ class ProductBase(BaseModel):
     brand_name: str
     product_name: str
     image_url: str
-    price: str
-    discount: str
-    likes: str
+    price: int
+    discount: int
+    likes: int
     reviews: str
     is_favorite: bool
     category: str
@@ -21,9 +21,9 @@ class ProductUpdate(BaseModel):
     brand_name: Optional[str] = None
     product_name: Optional[str] = None
     image_url: Optional[str] = None
-    price: Optional[str] = None
-    discount: Optional[str] = None
-    likes: Optional[str] = None
+    price: Optional[int] = None
+    discount: Optional[int] = None
+    likes: Optional[int] = None
     reviews: Optional[str] = None
     is_favorite: Optional[bool] = None
     category: Optional[str] = None
@@ -34,14 +34,6 @@ class Product(ProductBase):
 
     class Config:
         from_attributes = True
-    
-    def __init__(self, **data):
-        # 숫자 필드를 문자열로 변환
-        if 'price' in data and isinstance(data['price'], (int, float)):
-            data['price'] = str(data['price'])
-        if 'discount' in data and isinstance(data['discount'], (int, float)):
-            data['discount'] = str(data['discount'])
-        super().__init__(**data)
 
 # Q&A 모델
 class QABase(BaseModel):
@@ -0,0 +1,56 @@
+-- ============================================================================
+-- 상품/장바구니 RPC 함수
+-- ============================================================================
+-- 조회 후 갱신(SELECT -> UPDATE)을 한 번의 왕복으로 처리하고,
+-- 동시 요청 시 좋아요 수가 유실되는 경쟁 조건을 방지합니다.
+
+-- 즐겨찾기 토글 + 좋아요 수 증감 (갱신된 상품 행 반환)
+create or replace function toggle_favorite(p_id bigint)
+returns setof products
+language sql
+as $$
+    update products
+       set is_favorite = not is_favorite,
+           likes = greatest(
+               0,
+               coalesce(nullif(likes, '')::int, 0) + case when is_favorite then -1 else 1 end
+           )::text
+     where id = p_id
+    returning *;
+$$;
+
+-- 기존 중복 (user_id, product_id) 행 정리
+-- (이전 cart-add 는 조회 후 삽입 방식이라 동시 요청 시 중복 행이 생길 수 있음)
+-- 수량을 가장 먼저 생성된 행(최소 id)에 합산한 뒤 나머지 행을 삭제합니다.
+with duplicates as (
+    select user_id, product_id, min(id) as keep_id, sum(quantity) as total_quantity
+      from cart_items
+     group by user_id, product_id
+    having count(*) > 1
+)
+update cart_items c
+   set quantity = d.total_quantity
+  from duplicates d
+ where c.id = d.keep_id;
+
+delete from cart_items c
+ using cart_items k
+ where c.user_id = k.user_id
+   and c.product_id = k.product_id
+   and c.id > k.id;
+
+-- 장바구니 upsert 를 위한 유니크 인덱스
+create unique index if not exists cart_items_user_product_uq
+    on cart_items (user_id, product_id);
+
+-- 장바구니 추가 (이미 있으면 수량 누적, 갱신된 장바구니 행 반환)
+create or replace function add_to_cart(p_user_id bigint, p_product_id bigint, p_quantity int)
+returns setof cart_items
+language sql
+as $$
+    insert into cart_items (user_id, product_id, quantity, selected_options)
+    values (p_user_id, p_product_id, p_quantity, '')
+    on conflict (user_id, product_id)
+    do update set quantity = cart_items.quantity + excluded.quantity
+    returning *;
+$$;
@@ -0,0 +1,27 @@
+-- ============================================================================
+-- 상품 숫자 컬럼 타입 변경 (text -> integer)
+-- ============================================================================
+-- 가격/할인율/좋아요 수를 정수로 저장하여 문자열 <-> 정수 변환을 제거하고,
+-- likes 정렬이 사전순이 아닌 숫자 순으로 동작하도록 합니다.
+
+-- 기존 컬럼이 text/numeric 어느 타입이든, '39000.0' 같은 소수 표기여도 변환되도록
+-- text 로 맞춘 뒤 numeric 을 거쳐 integer 로 변환합니다.
+alter table products
+    alter column price type integer using coalesce(nullif(trim(price::text), ''), '0')::numeric::integer,
+    alter column discount type integer using coalesce(nullif(trim(discount::text), ''), '0')::numeric::integer,
+    alter column likes type integer using coalesce(nullif(trim(likes::text), ''), '0')::numeric::integer;
+
+alter table products
+    alter column likes set default 0;
+
+-- 즐겨찾기 토글 + 좋아요 수 증감 (정수 컬럼 기준으로 재정의)
+create or replace function toggle_favorite(p_id bigint)
+returns setof products
+language sql
+as $$
+    update products
+       set is_favorite = not is_favorite,
+           likes = greatest(0, coalesce(likes, 0) + case when is_favorite then -1 else 1 end)
+     where id = p_id
+    returning *;
+$$;
@@ -0,0 +1,14 @@
+-- ============================================================================
+-- 조회 성능용 인덱스
+-- ============================================================================
+-- (user_id, product_id) 복합 유니크 인덱스는 001_product_rpc.sql 에서
+-- add_to_cart upsert 용으로 이미 생성됩니다. (cart_items_user_product_uq)
+
+-- 즐겨찾기 상품 조회 (is_favorite = true 인 행만 포함하는 부분 인덱스)
+create index if not exists products_favorite_idx
+    on products (is_favorite)
+    where is_favorite;
+
+-- 최신순 상품 목록 페이지네이션
+create index if not exists products_created_at_idx
+    on products (created_at desc);
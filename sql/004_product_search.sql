@@ -0,0 +1,49 @@
+-- ============================================================================
+-- 상품 검색 (pg_trgm GIN 인덱스 + 짧은 검색어용 tsvector 인덱스)
+-- ============================================================================
+-- pg_trgm 은 3글자 이상 검색어에서만 '%검색어%' 패턴의 트라이그램을 추출할 수 있습니다.
+-- 1~2글자 검색어(예: 가방, 시계, 신발)는 트라이그램 인덱스를 사용할 수 없어
+-- 전체 테이블 스캔이 되므로, 단어 접두어 일치(tsvector GIN 인덱스)로 따로 처리합니다.
+
+create extension if not exists pg_trgm;
+
+-- 3글자 이상: 상품명/브랜드명 부분 일치
+create index if not exists products_product_name_trgm_idx
+    on products using gin (product_name gin_trgm_ops);
+
+create index if not exists products_brand_name_trgm_idx
+    on products using gin (brand_name gin_trgm_ops);
+
+-- 1~2글자: 상품명/브랜드명 단어 접두어 일치
+create index if not exists products_search_tsv_idx
+    on products using gin (
+        to_tsvector('simple', coalesce(product_name, '') || ' ' || coalesce(brand_name, ''))
+    );
+
+-- 상품 검색 (최신순)
+-- - 3글자 이상: 상품명 또는 브랜드명 부분 일치 (ILIKE '%q%')
+-- - 1~2글자: 상품명 또는 브랜드명 단어의 접두어 일치 ('가방' -> '가방', '가방끈', '미니 가방')
+--   단어 중간에 포함된 경우('미니가방')는 일치하지 않습니다.
+create or replace function search_products(q text)
+returns setof products
+language plpgsql
+stable
+as $$
+begin
+    if char_length(q) >= 3 then
+        return query
+            select *
+              from products p
+             where p.product_name ilike '%' || q || '%'
+                or p.brand_name ilike '%' || q || '%'
+             order by p.created_at desc;
+    else
+        return query
+            select *
+              from products p
+             where to_tsvector('simple', coalesce(p.product_name, '') || ' ' || coalesce(p.brand_name, ''))
+                   @@ to_tsquery('simple', '''' || replace(replace(q, '\', '\\'), '''', '''''') || ''':*')
+             order by p.created_at desc;
+    end if;
+end;
+$$;
@@ -1,10 +1,33 @@
-from supabase import create_client, Client
+from typing import Optional
+import httpx
+from supabase import acreate_client, AsyncClient, AsyncClientOptions
 from config import settings
 
-def get_supabase_client() -> Client:
-    """슈퍼베이스 클라이언트를 생성하고 반환합니다."""
-    supabase: Client = create_client(
+# Supabase HTTP 커넥션 풀 설정 (예상 동시 요청 수 x 2)
+MAX_CONNECTIONS = 100
+MAX_KEEPALIVE_CONNECTIONS = 20
+
+# 요청 타임아웃 (초) - 주입한 HTTP 클라이언트에는 supabase-py 의 기본값이 적용되지 않으므로
+# PostgREST 클라이언트 기본값(120초)과 동일하게 지정
+REQUEST_TIMEOUT = 120.0
+
+def create_http_client() -> httpx.AsyncClient:
+    """커넥션 풀링 및 HTTP/2 를 사용하는 HTTP 클라이언트를 생성합니다."""
+    return httpx.AsyncClient(
+        limits=httpx.Limits(
+            max_connections=MAX_CONNECTIONS,
+            max_keepalive_connections=MAX_KEEPALIVE_CONNECTIONS
+        ),
+        timeout=httpx.Timeout(REQUEST_TIMEOUT),
+        http2=True
+    )
+
+async def get_async_supabase_client(http_client: Optional[httpx.AsyncClient] = None) -> AsyncClient:
+    """비동기 슈퍼베이스 클라이언트를 생성하고 반환합니다. (앱 시작 시 1회 호출)"""
+    options = AsyncClientOptions(httpx_client=http_client) if http_client else None
+    supabase: AsyncClient = await acreate_client(
         settings.SUPABASE_URL,
-        settings.SUPABASE_ANON_KEY
+        settings.SUPABASE_ANON_KEY,
+        options=options
     )
     return supabase